@@ -1,11 +1,103 @@
+import itertools
 import os
-import requests
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import date
-from typing import List, Literal, Optional, Any, Dict, Type, Union
+from functools import lru_cache
+from typing import Any, Callable, Dict, Iterator, List, Literal, NoReturn, Optional, Type, TypeVar, Union
+
+import httpx
+import ijson
+from httpx._utils import get_environment_proxies
+import orjson
 from pydantic import BaseModel, Field, conlist, ValidationError as PydanticValidationError
 
-from apifakturownia.models import *
 from apifakturownia.errors import *
+from apifakturownia.models import *
+
+# Rozmiar puli połączeń HTTP klienta
+POOL_SIZE = 32
+
+# Domyślna maksymalna liczba stron listy faktur pobieranych równolegle
+LIST_MAX_WORKERS = 4
+
+# Ponawianie przy chwilowych błędach bramki; POST nie jest ponawiany, aby nie utworzyć zduplikowanej faktury
+RETRY_TOTAL = 3
+RETRY_BACKOFF_FACTOR = 0.3
+RETRY_STATUSES = frozenset([502, 503, 504])
+RETRY_METHODS = frozenset(['GET', 'PUT', 'DELETE'])
+
+# Mapowanie statusów HTTP na wyjątki (5xx oraz pozostałe statusy obsługiwane osobno)
+_ERROR_CLASSES = {
+    400: ValidationError,
+    401: AuthenticationError,
+    403: AuthenticationError,
+    404: ResourceNotFoundError,
+}
+
+# Maksymalna liczba bajtów ciała odpowiedzi z błędem dołączana do komunikatu wyjątku
+ERROR_BODY_PREVIEW = 512
+
+@lru_cache(maxsize=512)
+def _date_iso(d: date) -> str:
+    """Format ISO daty z pamięcią podręczną (te same zakresy dat są odpytywane wielokrotnie)."""
+    return d.isoformat()
+
+def _build_model_schemas() -> None:
+    """Buduje odroczone (defer_build) walidatory i serializatory modeli DTO."""
+    for model in (InvoicePositionDTO, InvoiceDTO):
+        model.model_rebuild()
+
+_warm_up_lock = threading.Lock()
+_warm_up_started = False
+
+def _warm_up_models_in_background() -> None:
+    """Jednorazowo (na proces) buduje schematy modeli w wątku tła, równolegle z nawiązywaniem połączenia."""
+    global _warm_up_started
+    with _warm_up_lock:
+        if _warm_up_started:
+            return
+        _warm_up_started = True
+    threading.Thread(target=_build_model_schemas, daemon=True).start()
+
+def _serialize_invoice(api_token: str, dto: InvoiceDTO, only_set: bool = False) -> bytes:
+    """Serializuje ciało zapytania zapisu; faktura zrzucana bezpośrednio do JSON przez rdzeń Pydantic.
+
+    Przy `only_set=True` (częściowa aktualizacja) serializowane są tylko pola jawnie ustawione
+    w DTO (`model_fields_set`), bez przeglądania pozostałych pól opcjonalnych.
+    """
+    include = dto.model_fields_set if only_set else None
+    invoice_json = dto.model_dump_json(include=include, by_alias=True, exclude_none=True).encode()
+    return orjson.dumps({'api_token': api_token, 'invoice': orjson.Fragment(invoice_json)})
+
+def _raise_api_error(response: Any) -> NoReturn:
+    """Mapuje odpowiedź httpx z błędem HTTP na niestandardowy wyjątek."""
+    status_code = response.status_code
+    content = response.content
+    error_message = f"Błąd API Fakturownia (HTTP {status_code})"
+    if content:
+        error_message += f": {content[:ERROR_BODY_PREVIEW].decode('utf-8', 'replace')}"
+
+    # Mapowanie błędów na niestandardowe wyjątki; szczegóły (JSON) dekodowane dopiero przy odczycie `details`
+    exc_class = _ERROR_CLASSES.get(status_code) or (ServerError if 500 <= status_code < 600 else FakturowniaAPIException)
+    raise exc_class(error_message, status_code, raw_details=content)
+
+def _decode_response(response: httpx.Response) -> Any:
+    """Zwraca zdekodowane ciało odpowiedzi 2xx (None dla pustego) lub zgłasza wyjątek dla statusu błędu."""
+    if not 200 <= response.status_code < 300:
+        _raise_api_error(response)
+    if response.status_code == 204 or not response.content: # DELETE często zwraca 204 No Content
+        return None
+    try:
+        return orjson.loads(response.content)
+    except orjson.JSONDecodeError:
+        raise FakturowniaAPIException("Nie udało się zdekodować odpowiedzi JSON.")
+
+def _network_error(error: httpx.HTTPError) -> FakturowniaAPIException:
+    """Opakowuje ogólny błąd sieciowy lub timeout httpx w wyjątek klienta."""
+    return FakturowniaAPIException(f"Błąd sieciowy podczas komunikacji z API: {error}")
+
 
 class InvoicesEndpoint:
     """Zarządca endpointu /invoices, implementujący logikę CRUD+."""
@@ -16,16 +108,17 @@ class InvoicesEndpoint:
 
     def create_invoice(self, invoice_data: InvoiceDTO) -> InvoiceDTO:
         """Dodaje nową fakturę (POST /invoices.json).[3]"""
-        payload = {'invoice': invoice_data.model_dump(by_alias=True, exclude_none=True)}
-        response_data = self.client._make_request('POST', self.endpoint_base, json_data=payload)
-        return InvoiceDTO.model_validate(response_data)
+        # Metody zapisu przekazują token również w ciele JSON [1]
+        payload = _serialize_invoice(self.client.api_token, invoice_data)
+        response_data = self.client._make_request('POST', self.endpoint_base, data=payload)
+        return InvoiceDTO._from_api(response_data)
 
     def get_invoice(self, invoice_id: int) -> InvoiceDTO:
         """Pobiera pojedynczą fakturę po ID (GET /invoices/{id}.json).[3]"""
-        endpoint = f'/invoices/{invoice_id}.json'
+        endpoint = self.client._invoice_url_tpl % invoice_id
         response_data = self.client._make_request('GET', endpoint)
         # Odpowiedź API Fakturownia często zwraca obiekt bezpośrednio, bez opakowania 'invoice'
-        return InvoiceDTO.model_validate(response_data)
+        return InvoiceDTO._from_api(response_data)
 
     def list_invoices(
             self, 
@@ -35,50 +128,89 @@ class InvoicesEndpoint:
             page: int = 1,
             per_page: int = 100,
             include_positions: bool = False,
-            **kwargs
-        ) -> List:
-        """Pobiera listę faktur z filtrowaniem i paginacją (GET /invoices.json).[2, 3]"""
+            **kwargs: Any
+        ) -> Iterator[InvoiceDTO]:
+        """Pobiera listę faktur z filtrowaniem i paginacją (GET /invoices.json).[2, 3]
+
+        Zmiana niekompatybilna wstecz: zamiast listy słowników zwracany jest leniwy generator
+        InvoiceDTO. Odpowiedź jest parsowana strumieniowo, po jednej fakturze, a zapytanie
+        wysyłane jest dopiero przy rozpoczęciu iteracji - błędy HTTP i sieciowe zgłaszane są
+        wtedy, a nie w miejscu wywołania. Aby pobrać całą stronę od razu, użyj `list(...)`.
+
+        DTO nie są walidowane. Przy `include_positions=False` są niepełne: `positions` jest
+        pustą listą (wbrew wymaganiu min. 1 pozycji), a ponowna walidacja takiego DTO się nie powiedzie.
+        """
         params = {
             'period': period,
             'page': page,
             'per_page': min(per_page, 100) # Ograniczenie do max 100 [2]
         }
         if date_from:
-            params['date_from'] = date_from.isoformat()
+            params['date_from'] = _date_iso(date_from)
         if date_to:
-            params['date_to'] = date_to.isoformat()
+            params['date_to'] = _date_iso(date_to)
         if include_positions:
              params['include_positions'] = 'true'
 
         params.update(kwargs) # Dodatkowe parametry jak 'kind', 'number'
 
-        response_data = self.client._make_request('GET', self.endpoint_base, request_params=params)
+        # API zwraca listę faktur; bez pozycji (include_positions=False) lista `positions` jest pusta
+        for item in self.client._stream_items('GET', self.endpoint_base, request_params=params):
+            yield InvoiceDTO._from_api(item)
+
+    def list_all_invoices(self, per_page: int = 100, max_workers: int = LIST_MAX_WORKERS,
+                          **kwargs: Any) -> List[InvoiceDTO]:
+        """Pobiera wszystkie strony listy faktur, kolejne strony równolegle (GET /invoices.json).
+
+        API nie zwraca liczby wyników, więc strony są pobierane oknami (1, 2, 4, ... do `max_workers`
+        stron naraz) aż do pierwszej niepełnej strony. Pozostałe argumenty trafiają do `list_invoices`.
+        """
+        per_page = min(per_page, 100)
+        max_workers = max(1, min(max_workers, POOL_SIZE)) # Nie więcej wątków niż połączeń w puli
+
+        first_page = list(self.list_invoices(page=1, per_page=per_page, **kwargs))
+        pages = [first_page]
+        if len(first_page) < per_page:
+            return first_page
 
-        # API zwraca listę słowników, które musimy zwalidować jako DTO
-        return response_data
+        def fetch_page(page: int) -> List[InvoiceDTO]:
+            return list(self.list_invoices(page=page, per_page=per_page, **kwargs))
 
-    def update_invoice(self, invoice_id: int, update_data: Union) -> InvoiceDTO:
+        # Okno rośnie stopniowo, aby przy kilku stronach nie wysyłać zbędnych zapytań do API z limitami
+        next_page = 2
+        window_size = 1
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            while True:
+                window = range(next_page, next_page + window_size)
+                for page_data in executor.map(fetch_page, window):
+                    pages.append(page_data)
+                    if len(page_data) < per_page:
+                        return list(itertools.chain.from_iterable(pages))
+                next_page += window_size
+                window_size = min(window_size * 2, max_workers)
+
+    def update_invoice(self, invoice_id: int, update_data: Union[InvoiceDTO, Dict[str, Any]]) -> InvoiceDTO:
         """Aktualizuje istniejącą fakturę (PUT /invoices/{id}.json).[2]"""
-        endpoint = f'/invoices/{invoice_id}.json'
+        endpoint = self.client._invoice_url_tpl % invoice_id
 
         if isinstance(update_data, InvoiceDTO):
-            payload = {'invoice': update_data.model_dump(by_alias=True, exclude_none=True)}
+            payload = _serialize_invoice(self.client.api_token, update_data, only_set=True)
         else:
             # W przypadku, gdy użytkownik przekazuje surowy słownik do aktualizacji (częściowa aktualizacja)
-            payload = {'invoice': update_data}
+            payload = orjson.dumps({'api_token': self.client.api_token, 'invoice': update_data})
 
-        response_data = self.client._make_request('PUT', endpoint, json_data=payload)
-        return InvoiceDTO.model_validate(response_data)
+        response_data = self.client._make_request('PUT', endpoint, data=payload)
+        return InvoiceDTO._from_api(response_data)
 
     def delete_invoice_permanently(self, invoice_id: int) -> bool:
         """Trwale usuwa fakturę (DELETE /invoices/{id}.json).[2]"""
-        endpoint = f'/invoices/{invoice_id}.json'
+        endpoint = self.client._invoice_url_tpl % invoice_id
         self.client._make_request('DELETE', endpoint)
         return True # Brak ciała, sukces jeśli status 200/204
 
     def void_invoice(self, invoice_id: int, reason: Optional[str] = None) -> bool:
         """Anuluje fakturę zmieniając jej status (POST /invoices/{id}/change_status.json).[2, 5]"""
-        endpoint = f'/invoices/{invoice_id}/change_status.json'
+        endpoint = self.client._change_status_tpl % invoice_id
         params = {'status': VOID_STATUS}
         if reason:
             # Chociaż API wymaga podania powodu w GUI [6], API może akceptować go w body lub jako parametr.
@@ -86,78 +218,136 @@ class InvoicesEndpoint:
             pass
 
         # Metoda POST używa tokena w query string dla tego endpointu zmiany statusu.
-        self.client._make_request('POST', endpoint, params=params)
+        self.client._make_request('POST', endpoint, request_params=params)
         return True
 
+def _http_transport(proxy: Optional[str] = None) -> httpx.HTTPTransport:
+    """Pula połączeń keep-alive z HTTP/2 - równoległe zapytania multipleksowane na jednym połączeniu TLS."""
+    return httpx.HTTPTransport(
+        http2=True,
+        limits=httpx.Limits(max_connections=POOL_SIZE, max_keepalive_connections=POOL_SIZE),
+        retries=RETRY_TOTAL, # Ponawianie nieudanych prób nawiązania połączenia
+        proxy=proxy,
+    )
+
+
+TransportT = TypeVar('TransportT')
+
+def _proxy_mounts(make_transport: Callable[[str], TransportT]) -> Dict[str, Optional[TransportT]]:
+    """Transporty dla proxy ze zmiennych środowiskowych (HTTPS_PROXY/NO_PROXY).
+
+    Jawnie przekazany transport wyłącza w httpx obsługę proxy ze środowiska, więc montujemy je sami;
+    None oznacza hosty z NO_PROXY, obsługiwane przez transport domyślny.
+    """
+    return {
+        pattern: make_transport(proxy_url) if proxy_url else None
+        for pattern, proxy_url in get_environment_proxies().items()
+    }
+
+def _retry_delay(request: httpx.Request, response: httpx.Response, attempt: int) -> Optional[float]:
+    """Opóźnienie przed ponowieniem zapytania lub None, jeśli odpowiedź należy zwrócić."""
+    if (attempt >= RETRY_TOTAL or request.method not in RETRY_METHODS
+            or response.status_code not in RETRY_STATUSES):
+        return None
+    return RETRY_BACKOFF_FACTOR * (1 << attempt)
+
+
+class _RetryTransport(httpx.BaseTransport):
+    """Transport httpx ponawiający idempotentne zapytania zakończone statusem z RETRY_STATUSES."""
+
+    def __init__(self, transport: httpx.BaseTransport):
+        self._transport = transport
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        attempt = 0
+        while True:
+            response = self._transport.handle_request(request)
+            delay = _retry_delay(request, response, attempt)
+            if delay is None:
+                return response
+            response.close()
+            time.sleep(delay)
+            attempt += 1
+
+    def close(self) -> None:
+        self._transport.close()
+
+
 class FakturowniaApiClient:
     """Główna klasa klienta Fakturownia API, zarządzająca autoryzacją i komunikacją."""
 
-    def __init__(self, domain: str, api_token: str, request_timeout: int = 10):
+    def __init__(self, domain: str, api_token: str, request_timeout: int = 10,
+                 transport: Optional[httpx.BaseTransport] = None):
         self.base_url = f"https://{domain}.fakturownia.pl"
         self.api_token = api_token
         self.timeout = request_timeout
-        self.session = requests.Session()
-        self.invoices = InvoicesEndpoint(self)
 
-        # Ustawienie nagłówków JSON dla wszystkich zapytań
-        self.session.headers.update({
-            'Accept': 'application/json',
-            'Content-Type': 'application/json',
-        })
+        mounts: Dict[str, Optional[_RetryTransport]] = {}
+        if transport is None:
+            transport = _http_transport()
+            mounts = _proxy_mounts(lambda proxy_url: _RetryTransport(_http_transport(proxy=proxy_url)))
 
-    def _make_request(self, method: str, endpoint: str,
-                      request_params: Optional[Any] = None,
-                      json_data: Optional[Any] = None) -> Any:
+        # Token autoryzacyjny dołączany przez klienta do query stringu każdego zapytania [2, 3]
+        self.http = httpx.Client(
+            base_url=self.base_url,
+            transport=_RetryTransport(transport),
+            mounts=mounts,
+            timeout=request_timeout,
+            params={'api_token': api_token},
+            headers={
+                'Accept': 'application/json',
+                'Content-Type': 'application/json',
+            },
+        )
+
+        # Prekompilowane szablony pełnych URL-i endpointów faktur
+        self._invoice_url_tpl = f"{self.base_url}/invoices/%s.json"
+        self._change_status_tpl = f"{self.base_url}/invoices/%s/change_status.json"
+
+        self.invoices = InvoicesEndpoint(self)
+        _warm_up_models_in_background()
 
-        full_url = self.base_url + endpoint
-        request_params = request_params.copy() if request_params else {}
-        request_json = json_data.copy() if json_data else {}
+    def __enter__(self) -> 'FakturowniaApiClient':
+        return self
 
-        # Dynamiczne wstrzykiwanie tokena autoryzacyjnego:
-        # 1. Metody zapisu (POST, PUT) - token w ciele JSON [1]
-        if method.upper() in ['POST', 'PUT']:
-            # Token musi być w głównym obiekcie JSON
-            if request_json is None:
-                request_json = {}
-                request_json['api_token'] = self.api_token
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
 
-        # 2. Metody odczytu/usuwania (GET, DELETE) - token w query string [2, 3]
-        elif method.upper() in ['GET', 'DELETE']:
-            request_params['api_token'] = self.api_token
+    def close(self) -> None:
+        """Zamyka pulę połączeń klienta."""
+        self.http.close()
 
+    def _make_request(self, method: str, endpoint: str,
+                      request_params: Optional[Dict[str, Any]] = None,
+                      data: Optional[bytes] = None) -> Any:
+        """Wysyła zapytanie z gotowym ciałem JSON (`data`) i zwraca zdekodowaną odpowiedź."""
+        # Endpoint może być ścieżką względną ('/invoices.json') lub gotowym pełnym URL-em z szablonu;
+        # nagłówek Content-Type: application/json ustawia już klient
         try:
-            response = self.session.request(
-                method,
-                full_url,
-                params=request_params,
-                json=request_json,
-                timeout=self.timeout
-            )
-
-        except requests.exceptions.RequestException as e:
-            # Obsługa ogólnych błędów sieciowych lub timeoutów
-            raise FakturowniaAPIException(f"Błąd sieciowy podczas komunikacji z API: {e}")
-
-        # Weryfikacja statusu HTTP
-        if 200 <= response.status_code < 300:
-            if response.status_code == 204 or not response.content: # DELETE często zwraca 204 No Content
-                return None
-            try:
-                return response.json()
-            except requests.JSONDecodeError:
-                raise FakturowniaAPIException("Nie udało się zdekodować odpowiedzi JSON.")
-
-        # Mapowanie błędów na niestandardowe wyjątki
-        error_details = response.json() if response.content else None
-        error_message = f"Błąd API Fakturownia (HTTP {response.status_code}): {response.text}"
-
-        if response.status_code == 400:
-            raise ValidationError(error_message, response.status_code, error_details)
-        elif response.status_code == 401 or response.status_code == 403:
-            raise AuthenticationError(error_message, response.status_code, error_details)
-        elif response.status_code == 404:
-            raise ResourceNotFoundError(error_message, response.status_code, error_details)
-        elif 500 <= response.status_code < 600:
-            raise ServerError(error_message, response.status_code, error_details)
-        else:
-            raise FakturowniaAPIException(error_message, response.status_code, error_details)
+            response = self.http.request(method, endpoint, params=request_params, content=data)
+        except httpx.HTTPError as e:
+            raise _network_error(e)
+        return _decode_response(response)
+
+    def _stream_items(self, method: str, endpoint: str,
+                      request_params: Optional[Any] = None) -> Iterator[Dict[str, Any]]:
+        """Wysyła zapytanie i strumieniowo zwraca kolejne elementy tablicy JSON z odpowiedzi."""
+        try:
+            with self.http.stream(method, endpoint, params=request_params) as response:
+                if not 200 <= response.status_code < 300:
+                    response.read()
+                    _raise_api_error(response)
+
+                # Parser ijson zasilany kolejnymi (już rozpakowanymi) fragmentami ciała
+                items = ijson.sendable_list()
+                parser = ijson.items_coro(items, 'item', use_float=True)
+                for chunk in response.iter_bytes():
+                    parser.send(chunk)
+                    yield from items
+                    del items[:]
+                parser.close()
+                yield from items
+        except ijson.JSONError:
+            raise FakturowniaAPIException("Nie udało się zdekodować odpowiedzi JSON.")
+        except httpx.HTTPError as e:
+            raise _network_error(e)
@@ -0,0 +1,164 @@
+import asyncio
+from typing import Any, Dict, List, Optional, Union
+
+import httpx
+import orjson
+
+from apifakturownia.api_client import (
+    POOL_SIZE,
+    RETRY_TOTAL,
+    _decode_response,
+    _network_error,
+    _proxy_mounts,
+    _retry_delay,
+    _serialize_invoice,
+    _warm_up_models_in_background,
+)
+from apifakturownia.errors import *
+from apifakturownia.models import *
+
+
+def _async_http_transport(proxy: Optional[str] = None) -> httpx.AsyncHTTPTransport:
+    """Asynchroniczna pula połączeń keep-alive z HTTP/2 (odpowiednik _http_transport)."""
+    return httpx.AsyncHTTPTransport(
+        http2=True,
+        limits=httpx.Limits(max_connections=POOL_SIZE, max_keepalive_connections=POOL_SIZE),
+        retries=RETRY_TOTAL, # Ponawianie nieudanych prób nawiązania połączenia
+        proxy=proxy,
+    )
+
+
+class _AsyncRetryTransport(httpx.AsyncBaseTransport):
+    """Asynchroniczny odpowiednik _RetryTransport (te same zasady ponawiania)."""
+
+    def __init__(self, transport: httpx.AsyncBaseTransport):
+        self._transport = transport
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        attempt = 0
+        while True:
+            response = await self._transport.handle_async_request(request)
+            delay = _retry_delay(request, response, attempt)
+            if delay is None:
+                return response
+            await response.aclose()
+            await asyncio.sleep(delay)
+            attempt += 1
+
+    async def aclose(self) -> None:
+        await self._transport.aclose()
+
+
+class AsyncInvoicesEndpoint:
+    """Asynchroniczny odpowiednik InvoicesEndpoint, pozwalający na równoległe operacje masowe."""
+
+    def __init__(self, client: 'AsyncFakturowniaApiClient'):
+        self.client = client
+        self.endpoint_base = '/invoices.json'
+
+    async def create_invoice(self, invoice_data: InvoiceDTO) -> InvoiceDTO:
+        """Dodaje nową fakturę (POST /invoices.json)."""
+        payload = _serialize_invoice(self.client.api_token, invoice_data)
+        response_data = await self.client._make_request('POST', self.endpoint_base, data=payload)
+        return InvoiceDTO._from_api(response_data)
+
+    async def create_invoices_bulk(
+            self, invoices: List[InvoiceDTO]
+        ) -> List[Union[InvoiceDTO, FakturowniaAPIException]]:
+        """Dodaje wiele faktur równolegle (najwyżej POOL_SIZE zapytań naraz).
+
+        Zwraca listę w kolejności wejściowej: dla każdej faktury utworzone DTO albo wyjątek,
+        który przerwał jej dodawanie. Błąd jednej faktury nie przerywa pozostałych, więc faktury
+        z wynikiem będącym DTO istnieją w systemie i nie należy ich wysyłać ponownie.
+        """
+        semaphore = asyncio.Semaphore(POOL_SIZE)
+
+        async def create_limited(invoice: InvoiceDTO) -> InvoiceDTO:
+            async with semaphore:
+                return await self.create_invoice(invoice)
+
+        results: List[Union[InvoiceDTO, FakturowniaAPIException]] = []
+        for result in await asyncio.gather(*(create_limited(i) for i in invoices), return_exceptions=True):
+            # Tylko błędy API są zwracane jako wynik; pozostałe wyjątki (błędy programistyczne) propagujemy
+            if isinstance(result, BaseException) and not isinstance(result, FakturowniaAPIException):
+                raise result
+            results.append(result)
+        return results
+
+    async def get_invoice(self, invoice_id: int) -> InvoiceDTO:
+        """Pobiera pojedynczą fakturę po ID (GET /invoices/{id}.json)."""
+        endpoint = self.client._invoice_url_tpl % invoice_id
+        response_data = await self.client._make_request('GET', endpoint)
+        return InvoiceDTO._from_api(response_data)
+
+    async def update_invoice(self, invoice_id: int, update_data: Union[InvoiceDTO, Dict[str, Any]]) -> InvoiceDTO:
+        """Aktualizuje istniejącą fakturę (PUT /invoices/{id}.json)."""
+        endpoint = self.client._invoice_url_tpl % invoice_id
+
+        if isinstance(update_data, InvoiceDTO):
+            payload = _serialize_invoice(self.client.api_token, update_data, only_set=True)
+        else:
+            payload = orjson.dumps({'api_token': self.client.api_token, 'invoice': update_data})
+
+        response_data = await self.client._make_request('PUT', endpoint, data=payload)
+        return InvoiceDTO._from_api(response_data)
+
+    async def delete_invoice_permanently(self, invoice_id: int) -> bool:
+        """Trwale usuwa fakturę (DELETE /invoices/{id}.json)."""
+        endpoint = self.client._invoice_url_tpl % invoice_id
+        await self.client._make_request('DELETE', endpoint)
+        return True
+
+
+class AsyncFakturowniaApiClient:
+    """Asynchroniczny klient Fakturownia API oparty o httpx (HTTP/2, pula połączeń)."""
+
+    def __init__(self, domain: str, api_token: str, request_timeout: int = 10,
+                 transport: Optional[httpx.AsyncBaseTransport] = None):
+        self.base_url = f"https://{domain}.fakturownia.pl"
+        self.api_token = api_token
+        self.timeout = request_timeout
+
+        # Jak w kliencie synchronicznym: ponawianie 502/503/504 dla GET/PUT/DELETE i proxy ze środowiska
+        mounts: Dict[str, Optional[_AsyncRetryTransport]] = {}
+        if transport is None:
+            transport = _async_http_transport()
+            mounts = _proxy_mounts(lambda proxy_url: _AsyncRetryTransport(_async_http_transport(proxy=proxy_url)))
+
+        self.http = httpx.AsyncClient(
+            base_url=self.base_url,
+            transport=_AsyncRetryTransport(transport),
+            mounts=mounts,
+            timeout=request_timeout,
+            params={'api_token': api_token},
+            headers={
+                'Accept': 'application/json',
+                'Content-Type': 'application/json',
+            },
+        )
+
+        # Prekompilowane szablony pełnych URL-i endpointów faktur (jak w FakturowniaApiClient)
+        self._invoice_url_tpl = f"{self.base_url}/invoices/%s.json"
+
+        self.invoices = AsyncInvoicesEndpoint(self)
+        _warm_up_models_in_background()
+
+    async def __aenter__(self) -> 'AsyncFakturowniaApiClient':
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        await self.aclose()
+
+    async def aclose(self) -> None:
+        """Zamyka pulę połączeń klienta."""
+        await self.http.aclose()
+
+    async def _make_request(self, method: str, endpoint: str,
+                            request_params: Optional[Dict[str, Any]] = None,
+                            data: Optional[bytes] = None) -> Any:
+        """Asynchroniczny odpowiednik FakturowniaApiClient._make_request."""
+        try:
+            response = await self.http.request(method, endpoint, params=request_params, content=data)
+        except httpx.HTTPError as e:
+            raise _network_error(e)
+        return _decode_response(response)
@@ -1,12 +1,27 @@
 
-from typing import Optional
+from functools import cached_property
+from typing import Any, Optional
+
+import orjson
 
 class FakturowniaAPIException(Exception):
     """Bazowa klasa dla wyjątków API Fakturownia."""
-    def __init__(self, message: str, status_code: Optional[int] = None, details: Optional[str] = None):
+    def __init__(self, message: str, status_code: Optional[int] = None, details: Optional[str] = None,
+                 raw_details: Optional[bytes] = None):
         super().__init__(message)
         self.status_code = status_code
-        self.details = details or {}
+        self._details = details
+        self._raw_details = raw_details
+
+    @cached_property
+    def details(self) -> Any:
+        """Szczegóły błędu: przekazane jawnie lub dekodowane z JSON ciała odpowiedzi przy pierwszym odczycie."""
+        if self._details is not None or not self._raw_details:
+            return self._details or {}
+        try:
+            return orjson.loads(self._raw_details) or {}
+        except orjson.JSONDecodeError:
+            return {}
 
 class AuthenticationError(FakturowniaAPIException):
     """Błąd 401/403: Niepoprawny token API lub brak dostępu."""
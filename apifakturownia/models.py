@@ -1,5 +1,6 @@
+import math
 from datetime import date
-from typing import List, Literal, Optional, Any, Dict, Type, Union
+from typing import Annotated, List, Literal, Optional, Any, Dict, Type, Union
 from pydantic import BaseModel, Field, conlist, ValidationError as PydanticValidationError
 
 from pydantic import ConfigDict, RootModel
@@ -13,6 +14,9 @@ DocumentKind = Literal['vat', 'proforma', 'correction', 'advance', 'final', 'cos
 VatRateLiteral = Literal['np', 'zw', 'disabled']
 VatRate = Union[int, float, str]
 
+# Pola dat InvoiceDTO, które API zwraca jako tekst ISO
+_API_DATE_FIELDS = ('sell_date', 'issue_date', 'payment_to')
+
 # Status anulowania dla endpointu change_status [2, 5]
 VOID_STATUS = 'anulowana'
 
@@ -46,6 +50,8 @@ class InvoicePositionDTO(BaseModel):
     # Konfiguracja Pydantic
     class Config:
         populate_by_name = True
+        # Schemat budowany przy pierwszym użyciu lub w tle przez klienta, nie przy imporcie
+        defer_build = True
         #arbitrary_types_allowed = True
 
 
@@ -70,7 +76,7 @@ class InvoiceDTO(BaseModel):
     payment_method: Optional[str] = Field('Przelew', description="Brak listy enumów, używamy stringa [2]")
 
     # Zagnieżdżone pozycje
-    positions: conlist(InvoicePositionDTO, min_length=1)
+    positions: Annotated[List[InvoicePositionDTO], Field(min_length=1)]
 
     # Pola dla faktur korygujących
     correction_reason: Optional[str] = None # Wymagane dla kind='correction' [1]
@@ -88,3 +94,28 @@ class InvoiceDTO(BaseModel):
         populate_by_name = True
         # Konfiguracja, aby umożliwić parsowanie pól tylko do odczytu z odpowiedzi API
         extra = 'ignore'
+        defer_build = True
+
+    @classmethod
+    def _from_api(cls, data: Dict[str, Any]) -> 'InvoiceDTO':
+        """Buduje DTO z odpowiedzi API bez ponownej walidacji (dane pochodzą z serwera).
+
+        Słownik `data` (świeżo zdekodowana odpowiedź) jest przejmowany i modyfikowany bez kopiowania.
+        """
+        # model_construct nie konwertuje typów - pola dat i ilości (API zwraca je jako tekst)
+        # konwertujemy ręcznie, aby DTO miało zadeklarowane typy i serializowało się bez ostrzeżeń
+        for field in _API_DATE_FIELDS:
+            value = data.get(field)
+            if isinstance(value, str):
+                data[field] = date.fromisoformat(value)
+        positions = []
+        for p in data.pop('positions', None) or []:
+            if isinstance(p.get('quantity'), str):
+                p['quantity'] = float(p['quantity'])
+            positions.append(InvoicePositionDTO.model_construct(**p))
+        return cls.model_construct(positions=positions, **data)
+
+    def positions_total_gross(self) -> float:
+        """Suma wartości brutto wszystkich pozycji faktury."""
+        # fsum: jedna pętla w C bez kumulacji błędów zaokrągleń przy wielu pozycjach
+        return math.fsum(map(float, (p.total_price_gross for p in self.positions)))
@@ -0,0 +1,197 @@
+from typing import Any, Callable, Dict, Iterator, List, Type
+
+import httpx
+import orjson
+import pytest
+
+from apifakturownia import api_client
+from apifakturownia.api_client import FakturowniaApiClient, _RetryTransport
+from apifakturownia.errors import (
+    AuthenticationError,
+    FakturowniaAPIException,
+    ResourceNotFoundError,
+    ServerError,
+    ValidationError,
+)
+from apifakturownia.models import InvoiceDTO
+
+Handler = Callable[[httpx.Request], httpx.Response]
+
+
+@pytest.fixture
+def make_client() -> Iterator[Callable[[Handler], FakturowniaApiClient]]:
+    clients: List[FakturowniaApiClient] = []
+
+    def make(handler: Handler) -> FakturowniaApiClient:
+        client = FakturowniaApiClient('test', 'token', transport=httpx.MockTransport(handler))
+        clients.append(client)
+        return client
+
+    yield make
+    for client in clients:
+        client.close()
+
+
+@pytest.fixture(autouse=True)
+def no_retry_backoff(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(api_client, 'RETRY_BACKOFF_FACTOR', 0)
+
+
+def _invoices(count: int) -> List[Dict[str, Any]]:
+    return [{'id': i, 'kind': 'vat', 'sell_date': '2024-01-01', 'issue_date': '2024-01-01'} for i in range(count)]
+
+
+@pytest.mark.parametrize('method, expected_attempts', [('GET', 1 + api_client.RETRY_TOTAL), ('POST', 1)])
+def test_retries_503_only_for_idempotent_methods(
+        make_client: Callable[[Handler], FakturowniaApiClient], method: str, expected_attempts: int) -> None:
+    attempts = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        attempts.append(request.method)
+        return httpx.Response(503)
+
+    with pytest.raises(ServerError):
+        make_client(handler)._make_request(method, '/invoices.json')
+    assert len(attempts) == expected_attempts
+
+
+def test_retry_returns_first_successful_response(make_client: Callable[[Handler], FakturowniaApiClient]) -> None:
+    statuses = iter([503, 502, 200])
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(next(statuses), content=b'{"id": 5}')
+
+    assert make_client(handler)._make_request('GET', '/invoices/5.json') == {'id': 5}
+
+
+def test_requests_use_configured_headers_and_token(make_client: Callable[[Handler], FakturowniaApiClient]) -> None:
+    seen: List[httpx.Request] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        seen.append(request)
+        return httpx.Response(204)
+
+    make_client(handler).invoices.delete_invoice_permanently(3)
+
+    assert str(seen[0].url) == 'https://test.fakturownia.pl/invoices/3.json?api_token=token'
+    assert seen[0].headers['Accept'] == 'application/json'
+
+
+def test_update_invoice_sends_only_set_fields_and_token(
+        make_client: Callable[[Handler], FakturowniaApiClient]) -> None:
+    seen: List[httpx.Request] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        seen.append(request)
+        return httpx.Response(200, content=orjson.dumps({**_invoices(1)[0], 'id': 9}))
+
+    update = InvoiceDTO.model_validate({
+        'kind': 'vat',
+        'sell_date': '2024-01-01',
+        'issue_date': '2024-01-01',
+        'buyer_name': 'Nowy nabywca',
+        'positions': [{'id': 1, 'name': 'Usługa', 'quantity': 1, 'total_price_gross': '123.00', 'tax': 23}],
+    })
+    make_client(handler).invoices.update_invoice(9, update)
+
+    request = seen[0]
+    body = orjson.loads(request.content)
+    assert request.method == 'PUT'
+    assert request.url.params['api_token'] == 'token'
+    assert body['api_token'] == 'token'
+    # Pola z wartościami domyślnymi (np. payment_method) nie są wysyłane przy aktualizacji
+    assert set(body['invoice']) == update.model_fields_set
+    assert 'payment_method' not in body['invoice']
+
+
+def test_create_invoice_sends_defaults_and_token(make_client: Callable[[Handler], FakturowniaApiClient]) -> None:
+    seen: List[httpx.Request] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        seen.append(request)
+        return httpx.Response(201, content=orjson.dumps({**_invoices(1)[0], 'id': 1}))
+
+    invoice = InvoiceDTO.model_validate({
+        'kind': 'vat',
+        'sell_date': '2024-01-01',
+        'issue_date': '2024-01-01',
+        'positions': [{'id': 1, 'name': 'Usługa', 'quantity': 1, 'total_price_gross': '123.00', 'tax': 23}],
+    })
+    make_client(handler).invoices.create_invoice(invoice)
+
+    body = orjson.loads(seen[0].content)
+    assert seen[0].url.params['api_token'] == 'token'
+    assert body['api_token'] == 'token'
+    assert body['invoice']['payment_method'] == 'Przelew'
+
+
+def test_env_proxy_is_mounted_with_retries(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setenv('HTTPS_PROXY', 'http://proxy.example:3128')
+    monkeypatch.setenv('NO_PROXY', 'localhost')
+
+    with FakturowniaApiClient('test', 'token') as client:
+        proxied = client.http._transport_for_url(httpx.URL(client.base_url))
+        direct = client.http._transport_for_url(httpx.URL('https://localhost/'))
+
+    assert isinstance(proxied, _RetryTransport)
+    assert proxied is not client.http._transport
+    assert direct is client.http._transport
+
+
+def test_list_invoices_truncated_json_raises_api_exception(
+        make_client: Callable[[Handler], FakturowniaApiClient]) -> None:
+    truncated = orjson.dumps(_invoices(2))[:-20]
+    client = make_client(lambda request: httpx.Response(200, content=truncated))
+
+    with pytest.raises(FakturowniaAPIException, match='zdekodować'):
+        list(client.invoices.list_invoices())
+
+
+def test_list_all_invoices_stops_at_first_short_page(make_client: Callable[[Handler], FakturowniaApiClient]) -> None:
+    requested_pages = []
+    page_sizes = {1: 100, 2: 100, 3: 30}
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        page = int(request.url.params['page'])
+        requested_pages.append(page)
+        return httpx.Response(200, content=orjson.dumps(_invoices(page_sizes.get(page, 0))))
+
+    invoices = make_client(handler).invoices.list_all_invoices(per_page=100)
+
+    assert len(invoices) == 230
+    # Strona 1, następnie okna o rozmiarze 1 (strona 2) i 2 (strony 3-4)
+    assert sorted(requested_pages) == [1, 2, 3, 4]
+
+
+@pytest.mark.parametrize('status_code, exc_class', [
+    (400, ValidationError),
+    (401, AuthenticationError),
+    (403, AuthenticationError),
+    (404, ResourceNotFoundError),
+    (500, ServerError),
+    (503, ServerError),
+    (418, FakturowniaAPIException),
+])
+def test_error_status_maps_to_exception_with_lazy_details(
+        make_client: Callable[[Handler], FakturowniaApiClient],
+        status_code: int, exc_class: Type[FakturowniaAPIException]) -> None:
+    client = make_client(lambda request: httpx.Response(status_code, content=b'{"message": "err"}'))
+
+    with pytest.raises(FakturowniaAPIException) as exc_info:
+        client._make_request('DELETE', '/invoices/1.json')
+
+    exc = exc_info.value
+    assert type(exc) is exc_class
+    assert exc.status_code == status_code
+    assert 'details' not in exc.__dict__ # Szczegóły nie są dekodowane przed pierwszym odczytem
+    assert exc.details == {'message': 'err'}
+
+
+def test_non_json_error_body_has_empty_details(make_client: Callable[[Handler], FakturowniaApiClient]) -> None:
+    client = make_client(lambda request: httpx.Response(502, content=b'<html>Bad gateway</html>'))
+
+    with pytest.raises(ServerError) as exc_info:
+        client._make_request('POST', '/invoices.json')
+
+    assert exc_info.value.details == {}
+    assert '<html>' in str(exc_info.value)
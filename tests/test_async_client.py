@@ -0,0 +1,68 @@
+import asyncio
+from typing import Callable, List, Union
+
+import httpx
+import orjson
+import pytest
+
+from apifakturownia import api_client
+from apifakturownia.async_client import AsyncFakturowniaApiClient
+from apifakturownia.errors import FakturowniaAPIException, ServerError, ValidationError
+from apifakturownia.models import InvoiceDTO
+
+Handler = Callable[[httpx.Request], httpx.Response]
+
+
+def _invoice(buyer_name: str) -> InvoiceDTO:
+    return InvoiceDTO.model_validate({
+        'kind': 'vat',
+        'sell_date': '2024-01-01',
+        'issue_date': '2024-01-01',
+        'buyer_name': buyer_name,
+        'positions': [{'id': 1, 'name': 'Usługa', 'quantity': 1, 'total_price_gross': '123.00', 'tax': 23}],
+    })
+
+
+def _client(handler: Handler) -> AsyncFakturowniaApiClient:
+    return AsyncFakturowniaApiClient('test', 'token', transport=httpx.MockTransport(handler))
+
+
+def test_create_invoices_bulk_returns_per_invoice_results() -> None:
+    created = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        invoice = orjson.loads(request.content)['invoice']
+        if invoice['buyer_name'] == 'bad':
+            return httpx.Response(400, content=b'{"code":"error"}')
+        created.append(invoice['buyer_name'])
+        return httpx.Response(201, content=orjson.dumps({**invoice, 'id': len(created)}))
+
+    async def run() -> List[Union[InvoiceDTO, FakturowniaAPIException]]:
+        async with _client(handler) as client:
+            return await client.invoices.create_invoices_bulk(
+                [_invoice('a'), _invoice('bad'), _invoice('b'), _invoice('c')])
+
+    results = asyncio.run(run())
+
+    assert [type(r) for r in results] == [InvoiceDTO, ValidationError, InvoiceDTO, InvoiceDTO]
+    error = results[1]
+    assert isinstance(error, ValidationError)
+    assert error.details == {'code': 'error'}
+    assert sorted(created) == ['a', 'b', 'c']
+
+
+def test_retries_503_on_get(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(api_client, 'RETRY_BACKOFF_FACTOR', 0)
+    attempts = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        attempts.append(request.method)
+        return httpx.Response(503)
+
+    async def run() -> None:
+        async with _client(handler) as client:
+            await client.invoices.get_invoice(1)
+
+    with pytest.raises(ServerError):
+        asyncio.run(run())
+    assert len(attempts) == 1 + api_client.RETRY_TOTAL
@@ -0,0 +1,22 @@
+import warnings
+from datetime import date
+
+from apifakturownia.models import InvoiceDTO
+
+
+def test_from_api_converts_dates_and_serializes_without_warnings() -> None:
+    invoice = InvoiceDTO._from_api({
+        'id': 7,
+        'kind': 'vat',
+        'sell_date': '2024-01-01',
+        'issue_date': '2024-01-02',
+        'payment_to': '2024-01-16',
+        'positions': [{'id': 1, 'name': 'Usługa', 'quantity': '2.0', 'total_price_gross': '246.00', 'tax': '23'}],
+    })
+
+    assert invoice.sell_date == date(2024, 1, 1)
+    assert invoice.payment_to == date(2024, 1, 16)
+    assert invoice.positions[0].quantity == 2.0
+    with warnings.catch_warnings():
+        warnings.simplefilter('error')
+        invoice.model_dump_json(by_alias=True, exclude_none=True)